@@ -5,259 +5,681 @@ This script tests all the implemented MCP protocol methods to ensure compatibili
 with the MCP Inspector and other MCP clients.
 """
 
-import json
-import requests
+import argparse
+import asyncio
+import httpx
+import ijson
+import itertools
+import orjson
+import socket
+import statistics
 import sys
-from typing import Dict, Any, Optional
+import time
+from jsonschema import Draft202012Validator
+from jsonschema.exceptions import best_match
+from pathlib import Path
+from typing import AsyncIterator, Awaitable, Callable, Dict, Any, Iterable, List, Optional, Tuple, TypeVar, Union
+from urllib.parse import quote, urlparse
+
+try:
+    import uvloop
+except ImportError:  # uvloop is optional and not available on Windows
+    uvloop = None
+
+try:
+    import h2  # noqa: F401  (only needs to be importable for httpx HTTP/2)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+try:
+    import zstandard
+except ImportError:  # only needed to compress request bodies, httpx decodes zstd itself
+    zstandard = None
+
+INITIALIZE_PARAMS = {
+    "protocolVersion": "2025-03-26",
+    "capabilities": {
+        "roots": {"listChanged": True}
+    },
+    "clientInfo": {
+        "name": "mcp-test-client",
+        "version": "1.0.0"
+    }
+}
+
+TOOLS_CALL_PARAMS = {
+    "name": "echo",
+    "arguments": {
+        "text": "Hello from MCP test!"
+    }
+}
+
+RESOURCES_READ_PARAMS = {
+    "uri": "text://hello"
+}
+
+PROMPTS_GET_PARAMS = {
+    "name": "greeting",
+    "arguments": {
+        "name": "MCP Tester"
+    }
+}
+
+# Status line templates shared by every test
+OK = "✅ {name} successful"
+OK_DETAIL = "✅ {name} successful: {detail}"
+FAIL = "❌ {name} failed: {reason}"
+TIMED_OUT = "❌ {name} timed out after {timeout:g}s"
+EXCEPTION = "❌ Test failed with exception: {error}"
+ABORTED = "❌ {name} aborted: server unreachable"
+
+# Fixed params are serialized once at import and spliced into each request
+INITIALIZE_PARAMS_BYTES = orjson.dumps(INITIALIZE_PARAMS)
+TOOLS_CALL_PARAMS_BYTES = orjson.dumps(TOOLS_CALL_PARAMS)
+RESOURCES_READ_PARAMS_BYTES = orjson.dumps(RESOURCES_READ_PARAMS)
+PROMPTS_GET_PARAMS_BYTES = orjson.dumps(PROMPTS_GET_PARAMS)
+
+# Request params, either as a dict or already JSON-encoded
+Params = Optional[Union[Dict[str, Any], bytes]]
+_T = TypeVar("_T")
+
+def result_schema(**properties: Dict[str, Any]) -> Dict[str, Any]:
+    """Build a schema for a JSON-RPC response whose result has ``properties``."""
+    return {
+        "type": "object",
+        "required": ["result"],
+        "properties": {
+            "result": {
+                "type": "object",
+                "required": list(properties),
+                "properties": properties
+            }
+        }
+    }
+
+def schema_error(validator: Draft202012Validator, response: Dict[str, Any]) -> Optional[str]:
+    """Return the most relevant schema violation in ``response``, if any."""
+    error = best_match(validator.iter_errors(response))
+    return error.message if error is not None else None
+
+def describe_error(error: BaseException) -> str:
+    """Return the message of ``error``, or its type name if it has none."""
+    return str(error) or type(error).__name__
+
+# Response validators, compiled once at import
+INITIALIZE_VALIDATOR = Draft202012Validator(result_schema(
+    protocolVersion={"type": "string"},
+    capabilities={"type": "object"},
+    serverInfo={"type": "object", "required": ["name", "version"]}
+))
+RESOURCES_LIST_VALIDATOR = Draft202012Validator(result_schema(
+    resources={"type": "array", "items": {"type": "object", "required": ["name", "uri"]}}
+))
+TOOLS_LIST_VALIDATOR = Draft202012Validator(result_schema(
+    tools={"type": "array", "items": {"type": "object", "required": ["name"]}}
+))
+PROMPTS_LIST_VALIDATOR = Draft202012Validator(result_schema(
+    prompts={"type": "array", "items": {"type": "object", "required": ["name"]}}
+))
+TOOLS_CALL_VALIDATOR = Draft202012Validator(result_schema(
+    content={"type": "array"}
+))
+RESOURCES_READ_VALIDATOR = Draft202012Validator(result_schema(
+    contents={"type": "array", "items": {"type": "object"}}
+))
+PROMPTS_GET_VALIDATOR = Draft202012Validator(result_schema(
+    messages={"type": "array"}
+))
+
+# Chunk size used when stream-parsing large response bodies
+STREAM_CHUNK_SIZE = 8192
+
+# JSON paths send_request_streamed materializes, everything else is skipped
+STREAMED_PATHS = frozenset(("error", "result", "result.contents", "result.contents.item"))
+
+# Statuses meaning the server refused a zstd-compressed request body
+ZSTD_REJECTED_STATUSES = (400, 415)
+
+# Last-seen */list results, so unchanged catalogs are not re-printed
+CACHE_DIR = Path(".mcp_cache")
+
+# How long to wait for the up-front TCP connect probe
+PROBE_TIMEOUT = 0.5
+
+# Concurrency cap and per-test deadline for the per-request fallback
+MAX_CONCURRENT_TESTS = 4
+TEST_TIMEOUT = 15.0
+
+# Timed-out requests of idempotent methods are retried with exponential
+# backoff while the TEST_TIMEOUT budget lasts; the first attempt always
+# gets the full REQUEST_TIMEOUT
+TIMEOUT_RETRIES = 2
+RETRY_BACKOFF = 0.1
+REQUEST_TIMEOUT = 10.0
+RETRYABLE_METHODS = frozenset(("resources/list", "tools/list", "prompts/list", "resources/read", "prompts/get"))
+
+# Methods whose warm latency should drop once server caches are primed;
+# each is timed sequentially, one cold call followed by WARM_SAMPLES calls
+CACHEABLE_METHODS = ("resources/list", "tools/list", "prompts/list")
+WARM_SAMPLES = 5
+WARM_RATIO_LIMIT = 0.9
+
+class ServerUnreachable(Exception):
+    """Raised when the MCP server refuses connections mid-suite."""
+
+class _Log:
+    """Collects one test's output so it reaches stdout in a single write."""
+    
+    def __init__(self):
+        self.lines: List[str] = []
+        
+    def add(self, line: str = "") -> None:
+        self.lines.append(line)
+        
+    def extend(self, lines: Iterable[str]) -> None:
+        self.lines.extend(lines)
+        
+    def flush(self) -> None:
+        # Trailing blank line separates consecutive tests
+        sys.stdout.write("\n".join(self.lines) + "\n\n")
+        self.lines = []
+
+class _ResponseReader:
+    """Expose a streamed httpx response through the async read() ijson expects."""
+    
+    def __init__(self, response: httpx.Response):
+        self._chunks: AsyncIterator[bytes] = response.aiter_bytes(STREAM_CHUNK_SIZE)
+        
+    async def read(self, size: int = -1) -> bytes:
+        if size == 0:
+            # ijson probes with read(0) to detect bytes vs str input
+            return b""
+        try:
+            return await self._chunks.__anext__()
+        except StopAsyncIteration:
+            return b""
 
 class MCPTester:
-    def __init__(self, base_url: str = "http://localhost:8080/mcp"):
+    def __init__(self, base_url: str = "http://localhost:8080/mcp", compress_requests: bool = False):
         self.base_url = base_url
-        self.request_id = 1
+        self._ids = itertools.count(1)
+        self.initialize_result: Optional[Dict[str, Any]] = None
         
-    def send_request(self, method: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """Send a JSON-RPC request to the MCP server."""
+        # None until the first batch attempt shows whether the server batches
+        self.batch_supported: Optional[bool] = None
+        
+        # Sequential latencies per cacheable method in nanoseconds, cold first
+        self.timings: Dict[str, List[int]] = {}
+        
+        self.http_version: Optional[str] = None
+        
+        # Keep-alive pool shared by every request in the suite. HTTP/2 is
+        # negotiated via ALPN on https:// URLs; concurrent tests are then
+        # multiplexed over one connection, plain http:// stays on HTTP/1.1
+        self.client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            headers={"Content-Type": "application/json"},
+            limits=httpx.Limits(max_keepalive_connections=8),
+            timeout=REQUEST_TIMEOUT
+        )
+        
+        # Request bodies are compressed only on opt-in; zstd responses say
+        # nothing about whether the server decodes zstd requests
+        self.zstd_requests = compress_requests and zstandard is not None
+        self._compressor = zstandard.ZstdCompressor(level=1) if self.zstd_requests else None
+        self._server_dead = False
+        
+    def encode_request(self, request_id: int, method: str, params: Params = None) -> bytes:
+        """Serialize a JSON-RPC request, splicing pre-encoded ``bytes`` params as-is."""
+        if isinstance(params, bytes):
+            # Method names are internal ASCII constants, no escaping needed
+            return (
+                b'{"jsonrpc":"2.0","id":' + str(request_id).encode()
+                + b',"method":"' + method.encode()
+                + b'","params":' + params + b"}"
+            )
+            
         payload = {
             "jsonrpc": "2.0",
-            "id": self.request_id,
+            "id": request_id,
             "method": method
         }
         
         if params:
             payload["params"] = params
             
-        self.request_id += 1
+        return orjson.dumps(payload)
+    
+    def compress_body(self, content: bytes) -> Tuple[bytes, Dict[str, str]]:
+        """Return the request body and extra headers, zstd-compressed if enabled."""
+        if not self.zstd_requests:
+            return content, {}
+        return self._compressor.compress(content), {"Content-Encoding": "zstd"}
+    
+    def zstd_rejected(self, headers: Dict[str, str], status_code: int) -> bool:
+        """Turn request compression off if the server refused a compressed body."""
+        if "Content-Encoding" not in headers or status_code not in ZSTD_REJECTED_STATUSES:
+            return False
+        self.zstd_requests = False
+        return True
+    
+    def mark_dead(self, error: httpx.ConnectError) -> ServerUnreachable:
+        """Record that the server refused a connection and build the error to raise."""
+        self._server_dead = True
+        return ServerUnreachable(f"Server unreachable at {self.base_url}: {error}")
+    
+    async def retry_timeouts(self, send: Callable[[float], Awaitable[_T]], retry: bool) -> _T:
+        """Await ``send(timeout)``, retrying timeouts if ``retry`` is set."""
+        # A single attempt may use the whole deadline
+        timeout = REQUEST_TIMEOUT if retry else TEST_TIMEOUT
+        deadline = time.monotonic() + TEST_TIMEOUT
+        
+        for attempt in range(TIMEOUT_RETRIES + 1):
+            try:
+                return await send(timeout)
+            except httpx.ConnectError as e:
+                raise self.mark_dead(e) from e
+            except httpx.TimeoutException:
+                backoff = RETRY_BACKOFF * 2 ** attempt
+                timeout = min(REQUEST_TIMEOUT, deadline - time.monotonic() - backoff)
+                if not retry or attempt == TIMEOUT_RETRIES or timeout <= 0:
+                    raise
+                await asyncio.sleep(backoff)
+    
+    async def post(self, content: bytes, retry: bool = False) -> httpx.Response:
+        """POST a request body and return the response, raising on non-2xx statuses."""
+        body, headers = self.compress_body(content)
+        response = await self.retry_timeouts(
+            lambda timeout: self.client.post(
+                self.base_url,
+                content=body,
+                headers=headers,
+                timeout=timeout
+            ),
+            retry
+        )
+        
+        if self.zstd_rejected(headers, response.status_code):
+            return await self.post(content, retry)
+        response.raise_for_status()
+        return response
+    
+    async def send_request(self, method: str, params: Params = None) -> Dict[str, Any]:
+        """Send a JSON-RPC request to the MCP server."""
+        content = self.encode_request(next(self._ids), method, params)
+        
+        try:
+            response = await self.post(content, retry=method in RETRYABLE_METHODS)
+            self.http_version = response.http_version
+            return orjson.loads(response.content)
+        except httpx.HTTPStatusError as e:
+            return {"error": {"http_status": e.response.status_code}}
+        except httpx.HTTPError as e:
+            return {"error": f"Request failed: {describe_error(e)}"}
+    
+    async def send_batch(self, calls: List[Tuple[str, Params]]) -> Optional[List[Dict[str, Any]]]:
+        """Send several requests as one batch, returning None if the server cannot batch."""
+        ids = [next(self._ids) for _ in calls]
+        content = b"[" + b",".join(
+            self.encode_request(request_id, method, params)
+            for request_id, (method, params) in zip(ids, calls)
+        ) + b"]"
+        
+        # Only a rejection means no batching; other errors are raised, since
+        # the server may already have run the batch and it must not be resent
+        try:
+            response = await self.post(content)
+        except httpx.HTTPStatusError:
+            return None
+            
+        body = orjson.loads(response.content)
+        if not isinstance(body, list):
+            return None
+            
+        by_id = {item.get("id"): item for item in body if isinstance(item, dict)}
+        return [
+            by_id.get(request_id, {"error": "No response in batch"})
+            for request_id in ids
+        ]
+    
+    async def send_request_streamed(
+        self,
+        method: str,
+        params: Params = None,
+        stop: Callable[[Dict[str, Any]], bool] = lambda item: False
+    ) -> Dict[str, Any]:
+        """Send a JSON-RPC request, parsing contents up to the first ``stop`` match."""
+        content, headers = self.compress_body(self.encode_request(next(self._ids), method, params))
         
         try:
-            response = requests.post(
-                self.base_url,
-                headers={"Content-Type": "application/json"},
-                data=json.dumps(payload),
-                timeout=10
+            return await self.retry_timeouts(
+                lambda timeout: self._read_streamed(content, headers, stop, timeout),
+                retry=method in RETRYABLE_METHODS
             )
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            return {"error": f"Request failed: {e}"}
+        except httpx.HTTPStatusError as e:
+            if self.zstd_rejected(headers, e.response.status_code):
+                return await self.send_request_streamed(method, params, stop)
+            return {"error": {"http_status": e.response.status_code}}
+        except httpx.HTTPError as e:
+            return {"error": f"Request failed: {describe_error(e)}"}
     
-    def test_initialize(self) -> bool:
-        """Test the initialize method."""
-        print("Testing initialize...")
-        
-        params = {
-            "protocolVersion": "2025-03-26",
-            "capabilities": {
-                "roots": {"listChanged": True}
-            },
-            "clientInfo": {
-                "name": "mcp-test-client",
-                "version": "1.0.0"
-            }
-        }
+    async def _read_streamed(
+        self,
+        content: bytes,
+        headers: Dict[str, str],
+        stop: Callable[[Dict[str, Any]], bool],
+        timeout: float
+    ) -> Dict[str, Any]:
+        """POST ``content`` once and stream-parse the response body."""
+        response: Dict[str, Any] = {}
+        contents: List[Any] = []
+        builder = None
+        target = ""
+        stopped = False
+        
+        def store(path: str, value: Any) -> bool:
+            """Place a parsed value in ``response``; True once ``stop`` matches."""
+            if path == "error":
+                response["error"] = value
+            elif path == "result":
+                response["result"] = value
+            elif path == "result.contents":
+                response["result"]["contents"] = value
+            else:
+                contents.append(value)
+                return isinstance(value, dict) and stop(value)
+            return False
         
-        response = self.send_request("initialize", params)
+        async with self.client.stream(
+            "POST",
+            self.base_url,
+            content=content,
+            headers=headers,
+            timeout=timeout
+        ) as http_response:
+            http_response.raise_for_status()
+            
+            async for prefix, event, value in ijson.parse_async(_ResponseReader(http_response)):
+                if stopped:
+                    # Only a lower bound if more items followed the match
+                    if prefix != "result.contents" or event != "end_array":
+                        response["partial"] = True
+                    break
+                
+                if builder is None:
+                    if prefix not in STREAMED_PATHS or event in ("map_key", "end_map", "end_array"):
+                        continue
+                    if prefix == "result" and event == "start_map":
+                        response["result"] = {}
+                    elif prefix == "result.contents" and event == "start_array":
+                        response["result"]["contents"] = contents
+                    elif event in ("start_map", "start_array"):
+                        # Anything else is kept whole so the schema sees it
+                        target, builder = prefix, ijson.ObjectBuilder()
+                        builder.event(event, value)
+                    else:
+                        stopped = store(prefix, value)
+                    continue
+                
+                builder.event(event, value)
+                if prefix == target and event in ("end_map", "end_array"):
+                    stopped = store(target, builder.value)
+                    builder = None
+        
+        return response
+
+    def catalog_unchanged(self, method: str, result: Dict[str, Any]) -> bool:
+        """Return True if a */list result matches the one cached by the last run."""
+        # Keyed by server URL and protocol version, rewritten whenever it differs
+        protocol = (self.initialize_result or {}).get("protocolVersion", "unknown")
+        path = CACHE_DIR / f"{quote(self.base_url, safe='')}_{protocol}_{method.replace('/', '_')}.json"
+        current = orjson.dumps(result, option=orjson.OPT_SORT_KEYS)
+        
+        try:
+            if path.read_bytes() == current:
+                return True
+        except OSError:
+            pass
+            
+        try:
+            CACHE_DIR.mkdir(exist_ok=True)
+            path.write_bytes(current)
+        except OSError:
+            pass
+        return False
+    
+    async def run_test(
+        self,
+        method: str,
+        params: Params,
+        validate: Callable[[Dict[str, Any], _Log], bool]
+    ) -> bool:
+        """Send a single request and validate its response."""
+        log = _Log()
+        log.add(f"Testing {method}...")
         
+        try:
+            response = await self.send_request(method, params)
+            return validate(response, log)
+        finally:
+            log.flush()
+    
+    async def test_initialize(self) -> bool:
+        """Test the initialize method."""
+        return await self.run_test("initialize", INITIALIZE_PARAMS_BYTES, self.validate_initialize)
+    
+    def validate_initialize(self, response: Dict[str, Any], log: _Log) -> bool:
+        """Validate an initialize response."""
         if "error" in response:
-            print(f"❌ Initialize failed: {response['error']}")
+            log.add(FAIL.format(name="Initialize", reason=response['error']))
             return False
             
-        if "result" not in response:
-            print(f"❌ Initialize failed: No result in response")
+        reason = schema_error(INITIALIZE_VALIDATOR, response)
+        if reason:
+            log.add(FAIL.format(name="Initialize", reason=reason))
             return False
             
         result = response["result"]
-        required_fields = ["protocolVersion", "capabilities", "serverInfo"]
-        
-        for field in required_fields:
-            if field not in result:
-                print(f"❌ Initialize failed: Missing {field} in result")
-                return False
-                
-        print("✅ Initialize successful")
-        print(f"   Server: {result['serverInfo']['name']} v{result['serverInfo']['version']}")
-        print(f"   Protocol: {result['protocolVersion']}")
+        self.initialize_result = result
+        log.add(OK.format(name="Initialize"))
+        log.add(f"   Server: {result['serverInfo']['name']} v{result['serverInfo']['version']}")
+        log.add(f"   Protocol: {result['protocolVersion']}")
+        log.add(f"   HTTP: {self.http_version}")
         return True
     
-    def test_resources_list(self) -> bool:
+    async def test_resources_list(self) -> bool:
         """Test the resources/list method."""
-        print("Testing resources/list...")
-        
-        response = self.send_request("resources/list")
-        
+        return await self.run_test("resources/list", None, self.validate_resources_list)
+    
+    def validate_resources_list(self, response: Dict[str, Any], log: _Log) -> bool:
+        """Validate a resources/list response."""
         if "error" in response:
-            print(f"❌ Resources list failed: {response['error']}")
+            log.add(FAIL.format(name="Resources list", reason=response['error']))
             return False
             
-        if "result" not in response or "resources" not in response["result"]:
-            print(f"❌ Resources list failed: No resources in response")
+        reason = schema_error(RESOURCES_LIST_VALIDATOR, response)
+        if reason:
+            log.add(FAIL.format(name="Resources list", reason=reason))
             return False
             
         resources = response["result"]["resources"]
-        print(f"✅ Resources list successful: {len(resources)} resources found")
+        log.add(OK_DETAIL.format(name="Resources list", detail=f"{len(resources)} resources found"))
         
-        for resource in resources:
-            print(f"   - {resource['name']}: {resource['uri']}")
+        if self.catalog_unchanged("resources/list", response["result"]):
+            log.add("   Unchanged since last run")
+            return True
             
+        log.extend(
+            f"   - {resource['name']}: {resource['uri']}"
+            for resource in resources
+        )
+        
         return True
     
-    def test_tools_list(self) -> bool:
+    async def test_tools_list(self) -> bool:
         """Test the tools/list method."""
-        print("Testing tools/list...")
-        
-        response = self.send_request("tools/list")
-        
+        return await self.run_test("tools/list", None, self.validate_tools_list)
+    
+    def validate_tools_list(self, response: Dict[str, Any], log: _Log) -> bool:
+        """Validate a tools/list response."""
         if "error" in response:
-            print(f"❌ Tools list failed: {response['error']}")
+            log.add(FAIL.format(name="Tools list", reason=response['error']))
             return False
             
-        if "result" not in response or "tools" not in response["result"]:
-            print(f"❌ Tools list failed: No tools in response")
+        reason = schema_error(TOOLS_LIST_VALIDATOR, response)
+        if reason:
+            log.add(FAIL.format(name="Tools list", reason=reason))
             return False
             
         tools = response["result"]["tools"]
-        print(f"✅ Tools list successful: {len(tools)} tools found")
+        log.add(OK_DETAIL.format(name="Tools list", detail=f"{len(tools)} tools found"))
         
-        for tool in tools:
-            print(f"   - {tool['name']}: {tool.get('description', 'No description')}")
+        if self.catalog_unchanged("tools/list", response["result"]):
+            log.add("   Unchanged since last run")
+            return True
             
+        log.extend(
+            f"   - {tool['name']}: {tool.get('description', 'No description')}"
+            for tool in tools
+        )
+        
         return True
     
-    def test_prompts_list(self) -> bool:
+    async def test_prompts_list(self) -> bool:
         """Test the prompts/list method."""
-        print("Testing prompts/list...")
-        
-        response = self.send_request("prompts/list")
-        
+        return await self.run_test("prompts/list", None, self.validate_prompts_list)
+    
+    def validate_prompts_list(self, response: Dict[str, Any], log: _Log) -> bool:
+        """Validate a prompts/list response."""
         if "error" in response:
-            print(f"❌ Prompts list failed: {response['error']}")
+            log.add(FAIL.format(name="Prompts list", reason=response['error']))
             return False
             
-        if "result" not in response or "prompts" not in response["result"]:
-            print(f"❌ Prompts list failed: No prompts in response")
+        reason = schema_error(PROMPTS_LIST_VALIDATOR, response)
+        if reason:
+            log.add(FAIL.format(name="Prompts list", reason=reason))
             return False
             
         prompts = response["result"]["prompts"]
-        print(f"✅ Prompts list successful: {len(prompts)} prompts found")
+        log.add(OK_DETAIL.format(name="Prompts list", detail=f"{len(prompts)} prompts found"))
         
-        for prompt in prompts:
-            print(f"   - {prompt['name']}: {prompt.get('description', 'No description')}")
+        if self.catalog_unchanged("prompts/list", response["result"]):
+            log.add("   Unchanged since last run")
+            return True
             
+        log.extend(
+            f"   - {prompt['name']}: {prompt.get('description', 'No description')}"
+            for prompt in prompts
+        )
+        
         return True
     
-    def test_tools_call(self) -> bool:
+    async def test_tools_call(self) -> bool:
         """Test the tools/call method."""
-        print("Testing tools/call...")
-        
-        params = {
-            "name": "echo",
-            "arguments": {
-                "text": "Hello from MCP test!"
-            }
-        }
-        
-        response = self.send_request("tools/call", params)
-        
+        return await self.run_test("tools/call", TOOLS_CALL_PARAMS_BYTES, self.validate_tools_call)
+    
+    def validate_tools_call(self, response: Dict[str, Any], log: _Log) -> bool:
+        """Validate a tools/call response."""
         if "error" in response:
-            print(f"❌ Tool call failed: {response['error']}")
+            log.add(FAIL.format(name="Tool call", reason=response['error']))
             return False
             
-        if "result" not in response:
-            print(f"❌ Tool call failed: No result in response")
+        reason = schema_error(TOOLS_CALL_VALIDATOR, response)
+        if reason:
+            log.add(FAIL.format(name="Tool call", reason=reason))
             return False
             
         result = response["result"]
-        if "content" not in result:
-            print(f"❌ Tool call failed: No content in result")
-            return False
-            
-        print("✅ Tool call successful")
-        print(f"   Result: {result['content']}")
+        log.add(OK.format(name="Tool call"))
+        log.add(f"   Result: {result['content']}")
         return True
     
-    def test_resources_read(self) -> bool:
+    async def test_resources_read(self) -> bool:
         """Test the resources/read method."""
-        print("Testing resources/read...")
-        
-        params = {
-            "uri": "text://hello"
-        }
-        
-        response = self.send_request("resources/read", params)
+        log = _Log()
+        log.add("Testing resources/read...")
         
+        try:
+            # Only the first text item is printed, so stop parsing once it arrives
+            response = await self.send_request_streamed(
+                "resources/read",
+                RESOURCES_READ_PARAMS_BYTES,
+                stop=lambda item: item.get("type") == "text"
+            )
+            return self.validate_resources_read(response, log)
+        finally:
+            log.flush()
+    
+    def validate_resources_read(self, response: Dict[str, Any], log: _Log) -> bool:
+        """Validate a resources/read response."""
         if "error" in response:
-            print(f"❌ Resource read failed: {response['error']}")
+            log.add(FAIL.format(name="Resource read", reason=response['error']))
             return False
             
-        if "result" not in response or "contents" not in response["result"]:
-            print(f"❌ Resource read failed: No contents in response")
+        reason = schema_error(RESOURCES_READ_VALIDATOR, response)
+        if reason:
+            log.add(FAIL.format(name="Resource read", reason=reason))
             return False
             
         contents = response["result"]["contents"]
-        print(f"✅ Resource read successful: {len(contents)} content items")
+        count = f"{len(contents)}+" if response.get("partial") else str(len(contents))
+        log.add(OK_DETAIL.format(name="Resource read", detail=f"{count} content items"))
         
         for content in contents:
             if content.get("type") == "text":
-                print(f"   Text: {content['text'][:50]}...")
+                log.add(f"   Text: {content['text'][:50]}...")
                 
         return True
     
-    def test_prompts_get(self) -> bool:
+    async def test_prompts_get(self) -> bool:
         """Test the prompts/get method."""
-        print("Testing prompts/get...")
-        
-        params = {
-            "name": "greeting",
-            "arguments": {
-                "name": "MCP Tester"
-            }
-        }
-        
-        response = self.send_request("prompts/get", params)
-        
+        return await self.run_test("prompts/get", PROMPTS_GET_PARAMS_BYTES, self.validate_prompts_get)
+    
+    def validate_prompts_get(self, response: Dict[str, Any], log: _Log) -> bool:
+        """Validate a prompts/get response."""
         if "error" in response:
-            print(f"❌ Prompt get failed: {response['error']}")
+            log.add(FAIL.format(name="Prompt get", reason=response['error']))
             return False
             
-        if "result" not in response:
-            print(f"❌ Prompt get failed: No result in response")
+        reason = schema_error(PROMPTS_GET_VALIDATOR, response)
+        if reason:
+            log.add(FAIL.format(name="Prompt get", reason=reason))
             return False
             
         result = response["result"]
-        if "messages" not in result:
-            print(f"❌ Prompt get failed: No messages in result")
-            return False
-            
-        print("✅ Prompt get successful")
-        print(f"   Description: {result.get('description', 'No description')}")
-        print(f"   Messages: {len(result['messages'])}")
+        log.add(OK.format(name="Prompt get"))
+        log.add(f"   Description: {result.get('description', 'No description')}")
+        log.add(f"   Messages: {len(result['messages'])}")
         return True
     
-    def run_all_tests(self) -> bool:
+    async def run_all_tests(self, passes: int = 1, warm_check: bool = False) -> bool:
         """Run all tests and return True if all pass."""
         print("🚀 Starting MCP Server Tests")
         print("=" * 50)
         
-        tests = [
-            self.test_initialize,
-            self.test_resources_list,
-            self.test_tools_list,
-            self.test_prompts_list,
-            self.test_tools_call,
-            self.test_resources_read,
-            self.test_prompts_get,
-        ]
-        
         passed = 0
-        total = len(tests)
+        total = 0
         
-        for test in tests:
-            try:
-                if test():
-                    passed += 1
-                print()  # Empty line between tests
-            except Exception as e:
-                print(f"❌ Test failed with exception: {e}")
-                print()
+        try:
+            if not self.server_reachable():
+                return False
+                
+            for pass_number in range(passes):
+                if passes > 1:
+                    label = "cold" if pass_number == 0 else "warm"
+                    print(f"🔁 Pass {pass_number + 1}/{passes} ({label})")
+                    print()
+                pass_passed, pass_total = await self._run_pass(
+                    measure_cache=warm_check and pass_number == 0
+                )
+                passed += pass_passed
+                total += pass_total
+                
+                if self._server_dead:
+                    break
+        finally:
+            await self.client.aclose()
         
         print("=" * 50)
         print(f"📊 Test Results: {passed}/{total} tests passed")
@@ -268,8 +690,197 @@ class MCPTester:
         else:
             print("❌ Some tests failed. Please check the server implementation.")
             return False
+    
+    def server_reachable(self) -> bool:
+        """Check that something is listening at base_url before running tests."""
+        parsed = urlparse(self.base_url)
+        host = parsed.hostname
+        port = parsed.port or (443 if parsed.scheme == "https" else 80)
+        
+        try:
+            socket.create_connection((host, port), timeout=PROBE_TIMEOUT).close()
+            return True
+        except OSError as e:
+            print(f"❌ Server unreachable at {host}:{port}: {e}")
+            return False
+    
+    async def _run_pass(self, measure_cache: bool = False) -> Tuple[int, int]:
+        """Run one pass of the suite and return (passed, total)."""
+        # Everything after initialize is independent and goes out as one batch
+        batched_tests = [
+            ("resources/list", None, self.validate_resources_list),
+            ("tools/list", None, self.validate_tools_list),
+            ("prompts/list", None, self.validate_prompts_list),
+            ("tools/call", TOOLS_CALL_PARAMS_BYTES, self.validate_tools_call),
+            ("resources/read", RESOURCES_READ_PARAMS_BYTES, self.validate_resources_read),
+            ("prompts/get", PROMPTS_GET_PARAMS_BYTES, self.validate_prompts_get),
+        ]
+        
+        passed = 0
+        total = len(batched_tests)
+        
+        # Later passes reuse the session the first one initialized
+        if self.initialize_result is None:
+            total += 1
+            try:
+                if await asyncio.wait_for(self.test_initialize(), timeout=TEST_TIMEOUT):
+                    passed += 1
+            except asyncio.TimeoutError:
+                print(TIMED_OUT.format(name="initialize", timeout=TEST_TIMEOUT))
+                print()
+            except Exception as e:
+                print(EXCEPTION.format(error=describe_error(e)))
+                print()
+        
+        # Time the cacheable methods before the suite itself warms them up
+        if measure_cache and self.initialize_result is not None and not self._server_dead:
+            try:
+                await self.measure_cache_latency()
+            except ServerUnreachable:
+                # The server is now flagged dead and the tests below abort
+                pass
+            
+        # Don't pay a connection error per test once the server is gone
+        if self._server_dead:
+            for method, _, _ in batched_tests:
+                print(ABORTED.format(name=method))
+            print()
+            return passed, total
+            
+        responses = None
+        if self.batch_supported is not False:
+            try:
+                responses = await asyncio.wait_for(
+                    self.send_batch([(method, params) for method, params, _ in batched_tests]),
+                    timeout=TEST_TIMEOUT
+                )
+            except ServerUnreachable:
+                for method, _, _ in batched_tests:
+                    print(ABORTED.format(name=method))
+                print()
+                return passed, total
+            except (asyncio.TimeoutError, httpx.TimeoutException):
+                # The server may still run the batch, so don't resend it
+                for method, _, _ in batched_tests:
+                    print(TIMED_OUT.format(name=method, timeout=TEST_TIMEOUT))
+                print()
+                return passed, total
+            except (httpx.RequestError, ValueError) as e:
+                # Nor if the reply broke off after the server may have run it
+                for method, _, _ in batched_tests:
+                    print(FAIL.format(name=method, reason=describe_error(e)))
+                print()
+                return passed, total
+            self.batch_supported = responses is not None
+        
+        if responses is None:
+            # Server does not support batching, send requests individually
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_TESTS)
+            
+            async def run_one(method: str) -> bool:
+                async with semaphore:
+                    if self._server_dead:
+                        raise ServerUnreachable()
+                    test = getattr(self, "test_" + method.replace("/", "_"))
+                    return await asyncio.wait_for(test(), timeout=TEST_TIMEOUT)
+                    
+            results = await asyncio.gather(
+                *(run_one(method) for method, _, _ in batched_tests),
+                return_exceptions=True
+            )
+        else:
+            results = []
+            for (method, _, validate), response in zip(batched_tests, responses):
+                log = _Log()
+                log.add(f"Testing {method}...")
+                try:
+                    results.append(validate(response, log))
+                except Exception as e:
+                    results.append(e)
+                finally:
+                    log.flush()
+        
+        for (method, _, _), result in zip(batched_tests, results):
+            if isinstance(result, asyncio.TimeoutError):
+                print(TIMED_OUT.format(name=method, timeout=TEST_TIMEOUT))
+                print()
+            elif isinstance(result, ServerUnreachable):
+                print(ABORTED.format(name=method))
+                print()
+            elif isinstance(result, BaseException):
+                print(EXCEPTION.format(error=describe_error(result)))
+                print()
+            elif result:
+                passed += 1
+        
+        return passed, total
+    
+    async def measure_cache_latency(self) -> None:
+        """Time one cold and WARM_SAMPLES warm calls of each cacheable method."""
+        # One request at a time over the connection initialize opened, so
+        # neither concurrency nor connection setup skews the samples
+        for method in CACHEABLE_METHODS:
+            samples = []
+            for _ in range(WARM_SAMPLES + 1):
+                start = time.perf_counter_ns()
+                response = await self.send_request(method)
+                if "error" in response:
+                    break
+                samples.append(time.perf_counter_ns() - start)
+            self.timings[method] = samples
+    
+    def check_warm_timings(self) -> bool:
+        """Print cold vs warm latencies and check cacheable methods sped up."""
+        print()
+        print(f"⏱️  Sequential latency (ms), warm = median of {WARM_SAMPLES} calls")
+        print(f"   {'method':<16} {'cold':>8}  {'warm':>8}  {'ratio':>8}")
+        
+        ok = True
+        for method in CACHEABLE_METHODS:
+            samples = self.timings.get(method, [])
+            if len(samples) < 2:
+                print(f"   {method:<16} not measured")
+                ok = False
+                continue
+                
+            cold = samples[0]
+            warm = statistics.median(samples[1:])
+            ratio = warm / cold if cold else 0.0
+            
+            flag = ""
+            if ratio > WARM_RATIO_LIMIT:
+                flag = "  ❌ not cached"
+                ok = False
+                
+            print(f"   {method:<16} {cold / 1e6:>8.2f}  {warm / 1e6:>8.2f}  {ratio:>8.2f}{flag}")
+            
+        return ok
 
 if __name__ == "__main__":
-    tester = MCPTester()
-    success = tester.run_all_tests()
-    sys.exit(0 if success else 1)
+    parser = argparse.ArgumentParser(description="Test the MCP server implementation.")
+    parser.add_argument(
+        "--warm-check",
+        action="store_true",
+        help="run the suite twice and fail if cacheable list methods are not faster when warm (timed sequentially)"
+    )
+    parser.add_argument(
+        "--zstd-requests",
+        action="store_true",
+        help="zstd-compress request bodies (the server must accept Content-Encoding: zstd)"
+    )
+    args = parser.parse_args()
+    if args.zstd_requests and zstandard is None:
+        parser.error("--zstd-requests requires the zstandard package")
+    
+    tester = MCPTester(compress_requests=args.zstd_requests)
+    run = uvloop.run if uvloop is not None else asyncio.run
+    success = run(tester.run_all_tests(
+        passes=2 if args.warm_check else 1,
+        warm_check=args.warm_check
+    ))
+    
+    if not success:
+        sys.exit(1)
+    if args.warm_check and not tester.check_warm_timings():
+        sys.exit(2)
+    sys.exit(0)